@@ -1,3 +1,3 @@
-from automaticLightCurve import automaticLightCurve
-import make4FGLxml
-import extras
+from flaapluc.automaticLightCurve import automaticLightCurve
+from flaapluc import make4FGLxml
+from flaapluc import extras
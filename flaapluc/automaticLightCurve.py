@@ -18,17 +18,31 @@ http://fermi.gsfc.nasa.gov/ssc/data/analysis/scitools/aperture_photometry.html
 @author Jean-Philippe Lenain <mailto:jlenain@in2p3.fr>
 """
 
+import atexit
+import calendar
 import datetime
 import glob
+import io
 import logging
 import matplotlib
 matplotlib.use('Agg')
+# Faster rasterization of the dense light-curve lines with Agg
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
 
 import os
+import smtplib
 import sys
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from email.mime.image import MIMEImage
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from pathlib import Path
 import numpy as np
-from ConfigParser import ConfigParser
+import requests
+from configparser import ConfigParser
 from matplotlib import pyplot as plt
 from matplotlib.ticker import FuncFormatter
 from matplotlib.dates import date2num, HourLocator, DayLocator, DateFormatter
@@ -42,8 +56,17 @@ from astropy import units as u
 from astropy import time as t
 
 import gt_apps as fermi
+from GtApp import GtApp
 from flaapluc import extras
 
+# scipy is optional: it only serves the density colouring of the energy vs
+# time plots; its availability is decided once here instead of per figure
+try:
+    from scipy import ndimage, signal, sparse
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
 
 # Flags
 BATCH = True
@@ -53,21 +76,243 @@ FLAGASSUMEDGAMMA = False
 
 # Global variables
 TOFFSET = 54000.  # offset in MJD for plot creation
+# Axis tick formatters, shared by all figures (they only depend on module
+# constants, bound as default arguments so each tick paint resolves them as
+# locals instead of going through a global lookup)
+FLUX_TICK_FORMATTER = FuncFormatter(lambda x, pos, _s=1e6: format(x * _s, '.2f'))
+MJD_TICK_FORMATTER = FuncFormatter(lambda x, pos, _o=TOFFSET: format(x - _o, '.0f'))
 # assumed photon index for a source not belonging to the 4FGL
 ASSUMEDGAMMA = -2.5
+# Creation stamp put on every figure, computed once per run instead of per
+# figure (one strftime + locale lookup per batch instead of per source)
+_CREATION_STAMP = time.strftime("%a, %d %b %Y %H:%M:%S", time.gmtime())
 
 # Visibility parameters
 ASTRONOMICAL_TWILIGHT_ANGLE = -16. * u.deg
 CIVIL_TWILIGHT_ANGLE = -12. * u.deg
 MOON_TWILIGHT_ANGLE = -0.83 * u.deg
+# The same angles, pre-parsed once for pyephem (which needs them as strings)
+ASTRO_HORIZON = ephem.degrees(str(ASTRONOMICAL_TWILIGHT_ANGLE.value))
+MOON_HORIZON = ephem.degrees(str(MOON_TWILIGHT_ANGLE.value))
+
+# gtexposure is not part of the gt_apps presets; build it once here, so that
+# its parameter file is only parsed at import time (see exposure)
+GTEXPOSURE = GtApp('gtexposure')
+
+# Cache of parsed configuration files, keyed by path
+CFG_CACHE = {}
+
+# Cache of parsed master source lists, keyed by path (see readSourceList)
+SRC_LIST_CACHE = {}
+# Name -> row index of the above, for O(1) single-source lookups
+SRC_INDEX_CACHE = {}
+
+# Mail fragments used by sendAlert, built once at import time and assembled
+# with a single join per alert
+MAIL_REPORT_TPL = """
+     FLaapLUC (Fermi/LAT automatic aperture photometry Light C<->Urve) report
+
+     *** The Fermi/LAT flux (%.0f MeV-%.0f GeV) of %s (%s, %s) %s the trigger threshold of %.2g ph cm^-2 s^-1 ***
+
+     Source coordinates (RA, Dec): %f %f
+
+     """
+
+MAIL_DAILY_TPL = """
+
+     The last daily-binned flux is:        %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: MET %.0f, MJD %.5f, %s)
+     and the last %.0f-day binned flux is: %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: MET %.0f, MJD %.5f, %s)
+
+"""
+
+MAIL_LONG_TPL = """
+
+     The last %.0f-day binned flux is:      %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: %.0f, MJD %.5f, %s)
+
+"""
+
+MAIL_MOONLIGHT_ONLY_TPL = """
+
+     *NOTE*: %s is visible from your site, but only observable under *moonlight* conditions.
+"""
+
+MAIL_MOONLIGHT_AND_DARK_TPL = """
+
+     *NOTE*: %s is visible from your site, and observable both under *dark* and *moonlight* conditions.
+"""
+
+MAIL_DARK_TPL = """
+
+     *NOTE*: %s is visible from your site, and observable under *dark* conditions.
+"""
+
+MAIL_TOO_TPL = """
+
+     *NOTE*: a ToO is currently ongoing on %s, this alert is forced.
+"""
+
+MAIL_ASSUMED_GAMMA_TPL = """
+
+     *WARNING*: The source %s is not found in the 4FGL catalogue, its photon index is thus assumed to be %.2f for the light curve computation.
+"""
+
+MAIL_DISCLAIMER = """
+
+     *Disclaimer*: Be careful, though, that these light curves are not computed using the usual, clean, standard (un)binned likelihood procedure one should normally use for a good quality, publication-ready result. Those reported here only rely on a "quick & dirty" aperture photometric analysis (cf. e.g. http://fermi.gsfc.nasa.gov/ssc/data/analysis/scitools/aperture_photometry.html), which basically assumes that the data set, within 1 degree around the source, is background-free.
+
+      Cheers,
+      FLaapLUC.
+"""
+
+# Pooled HTTP session for the Swift/BAT downloads, so that successive
+# transfers of a batch run reuse the same TCP connection
+BAT_SESSION = requests.Session()
+# Working URL remembered per source, to skip re-probing the weak/ subdir
+BAT_URL_CACHE = {}
+
+# Some sources need replacement names to match the Swift/BAT names
+BAT_NAME_MAP = {
+    '4U1907+09': 'H1907+097',
+    '1FGLJ1018.6-5856': '0FGLJ1018.2-5858',
+    'H1743-322': 'IGRJ17464-3213',
+    'V4641Sgr': 'SAXJ1819.3-2525',
+    '1E1841-04.5': 'Kes73',
+}
+# Download filenames for the aliased sources, precomputed once ('+' is not
+# allowed in the BAT file names)
+BAT_FILE_MAP = {k: v.replace('+', 'p') + '.lc.fits' for k, v in BAT_NAME_MAP.items()}
+
+# Catalog counterpart indexes, keyed by (catalog path, key column, value
+# column), see _catalogIndex
+CAT_INDEX_CACHE = {}
+
+
+def _catalogIndex(catfile, keycol, valcol):
+    """
+    Map the keycol column of a catalog FITS file onto its valcol column, as a
+    plain dict. Built once per catalog per process and cached, so that the
+    per-source counterpart searches become O(1) hash lookups instead of a
+    linear scan over a freshly re-opened FITS table. The first occurrence of
+    a key wins, matching what the previous first-match scan returned.
+    """
+    cachekey = (catfile, keycol, valcol)
+    try:
+        return CAT_INDEX_CACHE[cachekey]
+    except KeyError:
+        index = {}
+        with fits.open(catfile, memmap=True) as hdulist:
+            cat = hdulist[1].data
+            for key, val in zip(cat[keycol].astype(str), cat[valcol].astype(str)):
+                index.setdefault(key, val)
+        CAT_INDEX_CACHE[cachekey] = index
+        return index
 
 def getConfigList(option, sep=','):
     return [stuff for stuff in option.split(sep)]
 
 
+def fast_kde(x, y, gridsize=(400, 400), extents=None, sample=False):
+    """
+    FFT-based 2D kernel-density estimate, following the fast_kde recipe.
+
+    A 2D histogram of the points is convolved with a Gaussian kernel whose
+    bandwidth follows Scott's rule, instead of evaluating every sample
+    against every other one as scipy.stats.gaussian_kde does. This turns an
+    O(N^2) computation into O(N + G log G) for a G x G grid, with virtually
+    identical density maps on the photon-list sizes we deal with.
+
+    Input: x, y          coordinates of the samples
+           gridsize      (nx, ny) size of the evaluation grid
+           extents       (xmin, xmax, ymin, ymax), defaulted to the data extent
+           sample        if True, also interpolate the density back at each
+                         input point
+    Output: grid, extents[, density at each (x_i, y_i) when sample is True]
+    """
+    x = np.squeeze(np.asarray(x, dtype=np.float64))
+    y = np.squeeze(np.asarray(y, dtype=np.float64))
+    if x.size != y.size:
+        raise ValueError('Input x & y arrays must be the same size !')
+    nx, ny = gridsize
+    n = x.size
+
+    if extents is None:
+        xmin, xmax = x.min(), x.max()
+        ymin, ymax = y.min(), y.max()
+    else:
+        xmin, xmax, ymin, ymax = map(float, extents)
+    dx = (xmax - xmin) / (nx - 1)
+    dy = (ymax - ymin) / (ny - 1)
+
+    # Bin the samples on the grid: a sparse COO matrix sums the duplicate
+    # (i,j) entries into a 2D histogram in one pass
+    xyi = np.vstack((x, y)).T
+    xyi -= [xmin, ymin]
+    xyi /= [dx, dy]
+    xyi = np.floor(xyi, xyi).T
+    grid = sparse.coo_matrix((np.ones(n), xyi), shape=(nx, ny)).toarray()
+
+    # Gaussian kernel bandwidth from the covariance and Scott's rule
+    cov = np.cov(xyi)
+    scotts_factor = np.power(n, -1. / 6.)  # For 2D
+    std_devs = np.diag(np.sqrt(cov))
+    kern_nx, kern_ny = np.round(scotts_factor * 2. * np.pi * std_devs)
+    inv_cov = np.linalg.inv(cov * scotts_factor ** 2)
+
+    # Evaluate the Gaussian on the kernel grid, centred on <0,0>
+    xx = np.arange(kern_nx, dtype=np.float64) - kern_nx / 2.
+    yy = np.arange(kern_ny, dtype=np.float64) - kern_ny / 2.
+    xx, yy = np.meshgrid(xx, yy)
+    kernel = np.vstack((xx.flatten(), yy.flatten()))
+    kernel = np.dot(inv_cov, kernel) * kernel
+    kernel = np.exp(-np.sum(kernel, axis=0) / 2.)
+    kernel = kernel.reshape((int(kern_ny), int(kern_nx)))
+
+    # Convolve the histogram with the kernel, and normalize so that the
+    # units match the output of scipy.stats.gaussian_kde
+    grid = signal.convolve2d(grid, kernel, mode='same', boundary='fill').T
+    norm_factor = 2. * np.pi * cov * scotts_factor ** 2
+    norm_factor = np.linalg.det(norm_factor)
+    norm_factor = n * dx * dy * np.sqrt(norm_factor)
+    grid /= norm_factor
+
+    if sample:
+        # Bilinear interpolation of the grid back at each input point
+        coords = np.vstack([(y - ymin) / dy, (x - xmin) / dx])
+        density = ndimage.map_coordinates(grid, coords, order=1, mode='nearest')
+        return grid, (xmin, xmax, ymin, ymax), density
+    return grid, (xmin, xmax, ymin, ymax)
+
+
+def _initWorker():
+    """
+    Give each worker process a private PFILES user directory, so that
+    concurrent Fermi tools do not race on the same .par files.
+
+    Used as the initializer of the worker pools spawned by processSrc and by
+    bin/flaapluc-allsources.
+    """
+    pfiles = os.environ.get('PFILES', '')
+    # PFILES is '<user dirs>;<system dirs>': only the user part must be private
+    syspfiles = pfiles.split(';', 1)[1] if ';' in pfiles else pfiles
+    os.environ['PFILES'] = tempfile.mkdtemp(prefix='flaapluc-pfiles-') + ';' + syspfiles
+
+
+def _processMonth(args):
+    """
+    Process the long-term data of one given month for one given source.
+
+    Kept at module level so that it can be pickled and dispatched to worker
+    processes by processSrc when jobs > 1.
+    """
+    (mysrc, useThresh, daily, yearmonth, update, configfile, stopmonth, forcealert, too) = args
+    return processSrc(mysrc=mysrc, useThresh=useThresh, daily=daily, mail=False, longTerm=True, test=False,
+                      yearmonth=yearmonth, mergelongterm=False, update=update, configfile=configfile,
+                      stopmonth=stopmonth, forcealert=forcealert, too=too)
+
+
 def processSrc(mysrc=None, useThresh=False, daily=False, mail=True, longTerm=False, test=False, yearmonth=None,
                mergelongterm=False, withhistory=False, update=False, configfile='default.cfg', force_daily=False,
-               stopmonth=None, stopday=None, forcealert=False, too=False, log=logging.INFO):
+               stopmonth=None, stopday=None, forcealert=False, too=False, jobs=1, log=logging.INFO):
     """
     Process a given source.
     """
@@ -146,9 +391,11 @@ def processSrc(mysrc=None, useThresh=False, daily=False, mail=True, longTerm=Fal
         if not auto.daily:
             for file in glob.glob(auto.workDir + '/' + auto.src + '*'):
                 os.remove(file)
+                auto._existing.discard(os.path.basename(file))
         if auto.daily:
             for file in glob.glob(auto.workDir + '/' + auto.src + '*daily*'):
                 os.remove(file)
+                auto._existing.discard(os.path.basename(file))
 
         # TO BE CHANGED !!!
         startyearmonth = '200808'
@@ -165,30 +412,39 @@ def processSrc(mysrc=None, useThresh=False, daily=False, mail=True, longTerm=Fal
 
         # First make sure that all the month-by-month long-term data have been processed
         #
-        # Loop on month from 2008/08 to this month
-        for year in range(int(startyear), int(thisyear) + 1):
-            for month in range(1, 12 + 1):
-                # To retrieve the correct results directories, 'month' should be made of 2 digits
-                month = '%02d' % month
-                tmpyearmonth = str(year) + str(month)
-                if (year == int(startyear) and int(month) < int(startmonth)) or (
-                        year == int(thisyear) and int(month) > int(thismonth)):
-                    continue
-
-                # If year=thisyear and month=thismonth, we should remove all data for this source and reprocess everything again with fresh, brand new data !
-                # BUT only if update=True
-                if year == int(thisyear) and int(month) == int(thismonth) and update is True:
-                    tmpworkdir = auto.baseOutDir + "/longTerm/" + str(year) + str(month)
-                    if not auto.daily:
-                        for file in glob.glob(tmpworkdir + '/' + auto.src + '*'):
-                            os.remove(file)
-                    if auto.daily:
-                        for file in glob.glob(tmpworkdir + '/' + auto.src + '*daily*'):
-                            os.remove(file)
-
-                processSrc(mysrc=auto.src, useThresh=useThresh, daily=auto.daily, mail=False, longTerm=True, test=False,
-                           yearmonth=tmpyearmonth, mergelongterm=False, update=update, configfile=configfile,
-                           stopmonth=stopmonth, forcealert=forcealert, too=auto.too)
+        # Build the flat list of months to process, from 2008/08 to this month
+        # (the months are 2-digit formatted, to retrieve the correct results directories)
+        yearmonths = ['%d%02d' % (year, month)
+                      for year in range(int(startyear), int(thisyear) + 1)
+                      for month in range(1, 12 + 1)
+                      if not ((year == int(startyear) and month < int(startmonth)) or
+                              (year == int(thisyear) and month > int(thismonth)))]
+
+        # For the current year/month, we should remove all data for this source and reprocess everything again with fresh, brand new data !
+        # BUT only if update=True
+        if update is True and thisyearmonth in yearmonths:
+            tmpworkdir = auto.baseOutDir + "/longTerm/" + thisyearmonth
+            if not auto.daily:
+                for file in glob.glob(tmpworkdir + '/' + auto.src + '*'):
+                    os.remove(file)
+            if auto.daily:
+                for file in glob.glob(tmpworkdir + '/' + auto.src + '*daily*'):
+                    os.remove(file)
+
+        monthargs = [(auto.src, useThresh, auto.daily, tmpyearmonth, update, configfile,
+                      stopmonth, forcealert, auto.too) for tmpyearmonth in yearmonths]
+        if jobs > 1:
+            # The monthly light curves are independent from each other, process them in parallel
+            logging.info('[{src:s}] Processing {n:d} months over {jobs:d} workers'.format(src=auto.src,
+                                                                                          n=len(monthargs),
+                                                                                          jobs=jobs))
+            # Each worker gets a private PFILES user directory, otherwise the
+            # concurrent Fermi tools race on the same .par files
+            with ProcessPoolExecutor(max_workers=jobs, initializer=_initWorker) as executor:
+                list(executor.map(_processMonth, monthargs))
+        else:
+            for args in monthargs:
+                _processMonth(args)
 
         # Then merge the GTI files together, and run createXML, photoLC, exposure, createDAT, createLCfig, createEnergyTimeFig. No mail is sent here.
         auto.mergeGTIfiles()
@@ -229,8 +485,9 @@ def processSrc(mysrc=None, useThresh=False, daily=False, mail=True, longTerm=Fal
         auto.photoLC()
         auto.exposure(gamma=mygamma)
         auto.createDAT()
-        auto.createLCfig()
-        auto.createEnergyTimeFig()
+        # The trigger decision only needs the numpy arrays of the .dat light
+        # curve; the figures are rendered on demand by sendAlert, only when
+        # they can actually be attached to an alert mail
         alertSent = auto.sendAlert(nomailall=test, sendmail=mail)
     except KeyError:
         return False, False
@@ -246,6 +503,50 @@ class automaticLightCurve:
     Main class, for a given of source.
     """
 
+    # Cache of the per-night Sun/Moon rise and set events, which only depend
+    # on the site and the night, not on the source. Shared across all the
+    # instances of a batch run (see is_visible).
+    _nightCache = {}
+
+    # SMTP connection shared across the alerts of a batch run, kept open
+    # between calls to sendAlert (see _getSMTP) and closed at program exit.
+    _smtp = None
+    _smtpRegistered = False
+
+    @classmethod
+    def _getSMTP(cls):
+        """
+        Return an open connection to the local SMTP server, reusing the
+        previous one if it is still alive.
+        """
+        if cls._smtp is not None:
+            try:
+                if cls._smtp.noop()[0] == 250:
+                    return cls._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            cls._smtp = None
+        smtp = smtplib.SMTP()
+        smtp.set_debuglevel(0)
+        smtp.connect()
+        if not cls._smtpRegistered:
+            atexit.register(cls._closeSMTP)
+            cls._smtpRegistered = True
+        cls._smtp = smtp
+        return smtp
+
+    @classmethod
+    def _closeSMTP(cls):
+        """
+        Close the shared SMTP connection, if any.
+        """
+        if cls._smtp is not None:
+            try:
+                cls._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            cls._smtp = None
+
     def __init__(self, file=None, customThreshold=False, daily=False,
                  longTerm=False, yearmonth=None, mergelongterm=False,
                  withhistory=False, stopmonth=None, stopday=None,
@@ -293,14 +594,27 @@ class automaticLightCurve:
         except:
             self.lowerExposure = 0.
 
-        # Read maxz and maxZA as lists, not as single floats
-        self.maxz = [float(i) for i in getConfigList(self.config.get('AlertTrigger', 'MaxZ'))]
-        self.maxZA = [float(i) for i in getConfigList(self.config.get('AlertTrigger', 'MaxZA'))]
+        # Read maxz and maxZA as numpy arrays, not as single floats, so that
+        # downstream comparisons against them are vectorized. The (z, ZA)
+        # pairs are sorted by increasing z, so lookups can use searchsorted.
+        self.maxz = np.asarray([float(i) for i in getConfigList(self.config.get('AlertTrigger', 'MaxZ'))])
+        self.maxZA = np.asarray([float(i) for i in getConfigList(self.config.get('AlertTrigger', 'MaxZA'))])
+        zorder = np.argsort(self.maxz)
+        self.maxz = self.maxz[zorder]
+        self.maxZA = self.maxZA[zorder]
         try:
-            self.checkVisibility = self.config.get('Site', 'CheckVisibility')
+            # Convert the config string to a real boolean once and for all
+            self.checkVisibility = self.config.get('Site', 'CheckVisibility').lower() == 'true'
             self.siteLon = float(self.config.get('Site', 'SiteLongitude'))
             self.siteLat = float(self.config.get('Site', 'SiteLatitude'))
             self.siteAlt = float(self.config.get('Site', 'SiteAltitude'))
+            # Build the pyephem site observer once and for all; the consumers
+            # (is_visible, createVisibilityPlot) only reset its date/horizon
+            self.ephemSite = ephem.Observer()
+            self.ephemSite.lon = ephem.degrees(str(self.siteLon))  # ephem needs this as string
+            self.ephemSite.lat = ephem.degrees(str(self.siteLat))  # ephem needs this as string
+            self.ephemSite.elev = self.siteAlt  # meters
+            self.ephemSite.compute_pressure()
         except:
             # Don't check the source visibility, by default
             self.checkVisibility = False
@@ -343,6 +657,15 @@ class automaticLightCurve:
                 os.makedirs(self.workDir)
             except OSError:
                 pass
+        # Snapshot of the files already present in workDir, so that the
+        # per-step output checks don't each stat the (possibly remote)
+        # filesystem. Kept up to date whenever a step creates or removes
+        # one of its products.
+        self._existing = set(os.listdir(self.workDir))
+        # Per-path cache of parsed .dat light curves (see _load_lc)
+        self._lc_cache = {}
+        # Cached long-term flux statistics (see dynamicalTrigger)
+        self._dyn_cache = None
 
         self.fermiDir = os.getenv('FERMI_DIR')
 
@@ -373,9 +696,10 @@ class automaticLightCurve:
 
         self.stopmonth = stopmonth
 
-        # Open allsky file to get the start and stop dates
+        # Grab the primary header of the allsky file to get the start and stop dates,
+        # without materializing the full (multi-GB) HDU list
         try:
-            hdu = fits.open(self.allsky)
+            header = fits.getheader(self.allsky, 0)
         except IOError as e:
             logging.error("""I/O error ({errno}): can not open file {f}: {err}
 I will create the allsky file on the fly for you, for the last month of available data, using enrico.
@@ -394,8 +718,7 @@ First, retrieving the last photon files...
             assert (r == 0), "Could not properly generate the allsky file."
             import enrico.data
             self.allsky = enrico.data.PREPROCESSED_DIR + '/source/all/emin_000100/gtselect.fits'
-            hdu = fits.open(self.allsky)
-        header = hdu[0].header
+            header = fits.getheader(self.allsky, 0)
 
         self.filtermoon = self.hasmoon()
         
@@ -424,13 +747,15 @@ First, retrieving the last photon files...
                 year = yearmonth[:-2]
                 month = yearmonth[-2:]
 
-                # Get date of first day of yearmonth at 00:00:00, in UNIX time (timetuple transform a datetime object in time object ???)
-                #                                                        year         month   day   hour   minute  second  microsecond
-                yearmonthStart = time.mktime(datetime.datetime(int(year), int(month), 1, 0, 0, 0, 0).timetuple())
+                # Get date of first day of yearmonth at 00:00:00, in UNIX time.
+                # calendar.timegm interprets the tuple as UTC, contrary to time.mktime
+                # which would apply the local timezone offset (MJD is UTC-based !)
+                #                                                           year         month   day   hour   minute  second  microsecond
+                yearmonthStart = calendar.timegm(datetime.datetime(int(year), int(month), 1, 0, 0, 0, 0).timetuple())
                 if int(month) < 12:
-                    yearmonthStop = time.mktime(datetime.datetime(int(year), int(month) + 1, 1, 0, 0, 0, 0).timetuple())
+                    yearmonthStop = calendar.timegm(datetime.datetime(int(year), int(month) + 1, 1, 0, 0, 0, 0).timetuple())
                 else:
-                    yearmonthStop = time.mktime(datetime.datetime(int(year) + 1, 1, 1, 0, 0, 0, 0).timetuple())
+                    yearmonthStop = calendar.timegm(datetime.datetime(int(year) + 1, 1, 1, 0, 0, 0, 0).timetuple())
 
                 # Convert these from UNIX time to MET
                 tmptstart = extras.mjd2met(extras.unixtime2mjd(yearmonthStart))
@@ -455,11 +780,43 @@ First, retrieving the last photon files...
                 self.tstop = missionStop
 
     def getConfig(self, configfile='./default.cfg'):
-        """Get configuration from a configuration file."""
-        self.config = ConfigParser()
-        self.config.readfp(open(configfile))
+        """Get configuration from a configuration file. Already-parsed files are cached, so that spawning many instances parses each file only once."""
+        try:
+            self.config = CFG_CACHE[configfile]
+        except KeyError:
+            config = ConfigParser()
+            if not config.read(configfile):
+                raise IOError('Can not open configuration file {f:s}'.format(f=configfile))
+            CFG_CACHE[configfile] = config
+            self.config = config
         return self.config
 
+    def _path(self, suffix, daily=None):
+        """
+        Build the workDir path of a per-source product file, handling the
+        daily/default naming convention in one place.
+        """
+        if daily is None:
+            daily = self.daily
+        return os.path.join(self.workDir,
+                            '{src}{daily}{suffix}'.format(src=self.src,
+                                                          daily='_daily' if daily else '',
+                                                          suffix=suffix))
+
+    def _load_lc(self, path):
+        """
+        Read a .dat light-curve file in one pass, returning its (MET, MJD,
+        flux, fluxErr) columns as numpy arrays. The parsed columns are cached
+        per file path, so that Triggered and createLCfig do not re-parse the
+        same file within one processing pass.
+        """
+        try:
+            return self._lc_cache[path]
+        except KeyError:
+            cols = np.loadtxt(path, skiprows=1, usecols=(0, 1, 2, 3), unpack=True, ndmin=2)
+            self._lc_cache[path] = cols
+            return cols
+
     def readSourceList(self, mysrc=None):
         """
         Read the list of sources.
@@ -467,11 +824,18 @@ First, retrieving the last photon files...
         @todo Use a mySQL database instead of an ASCII file for the list of sources ?
         """
 
+        # Parse the source list only once per process: several instances are
+        # created during a run (e.g. the long-term pass preceding a daily one,
+        # or the all-sources driver), and they all read the same file
         try:
-            srcList = ascii.read(self.file)
-        except IOError:
-            logging.error('Can not open {f:s}'.format(f=self.file))
-            sys.exit(1)
+            srcList = SRC_LIST_CACHE[self.file]
+        except KeyError:
+            try:
+                srcList = ascii.read(self.file)
+            except IOError:
+                logging.error('Can not open {f:s}'.format(f=self.file))
+                sys.exit(1)
+            SRC_LIST_CACHE[self.file] = srcList
 
         src = srcList['Name']
         ra = srcList['RA']
@@ -484,26 +848,32 @@ First, retrieving the last photon files...
 
         # If we ask for a particular source, return the parameters for that source
         if mysrc != None:
-            # Find our input src in the list of sources
-            for i in range(len(src)):
-                if src[i] == mysrc:
-                    # Redefine the threshold if we provided a custom threshold
-                    if self.customThreshold and myThreshold[i] != 0.:
-                        try:
-                            self.threshold = float(myThreshold[i])
-                            logging.debug('[{src:s}] Read threshold={th} from source list'.format(src=mysrc,th=self.threshold))
-                        except ValueError:
-                            logging.warning('The threshold of the source {src:s} is ill-defined (not a float). Please, check the list of sources !'.format(src=mysrc))
-                            sys.exit(2)
-                    self.src = src[i]
-                    self.ra = ra[i]
-                    self.dec = dec[i]
-                    self.z = z[i]
-                    self.fglName = fglName[i]
-                    if self.fglName == 'None':
-                        self.fglName = None
-                    self.too = too[i]
-                    return
+            # Find our input src through a name index built once per source
+            # list, instead of scanning the whole table on every lookup
+            try:
+                index = SRC_INDEX_CACHE[self.file]
+            except KeyError:
+                index = {name: i for i, name in enumerate(src)}
+                SRC_INDEX_CACHE[self.file] = index
+            i = index.get(mysrc)
+            if i is not None:
+                # Redefine the threshold if we provided a custom threshold
+                if self.customThreshold and myThreshold[i] != 0.:
+                    try:
+                        self.threshold = float(myThreshold[i])
+                        logging.debug('[{src:s}] Read threshold={th} from source list'.format(src=mysrc,th=self.threshold))
+                    except ValueError:
+                        logging.warning('The threshold of the source {src:s} is ill-defined (not a float). Please, check the list of sources !'.format(src=mysrc))
+                        sys.exit(2)
+                self.src = src[i]
+                self.ra = ra[i]
+                self.dec = dec[i]
+                self.z = z[i]
+                self.fglName = fglName[i]
+                if self.fglName == 'None':
+                    self.fglName = None
+                self.too = too[i]
+                return
 
             logging.warning('\033[92mCan\'t find your source {src:s} in the list of sources !\033[0m'.format(src=mysrc))
             self.src = None
@@ -528,14 +898,11 @@ First, retrieving the last photon files...
             fermi.filter['infile'] = self.allsky
         else:
             fermi.filter['infile'] = '@%s' % self.allsky
-        if self.daily:
-            outfile = self.workDir + '/' + str(self.src) + '_daily.fits'
-        else:
-            outfile = self.workDir + '/' + str(self.src) + '.fits'
+        outfile = self._path('.fits')
         fermi.filter['outfile'] = outfile
 
         # If outfile already exists, we don't do anything
-        if os.path.isfile(outfile):
+        if os.path.basename(outfile) in self._existing:
             return True
 
         fermi.filter['ra'] = self.ra
@@ -549,18 +916,14 @@ First, retrieving the last photon files...
         fermi.filter['evclass'] = 128
         logging.info('Running gtselect')
         fermi.filter.run()
+        self._existing.add(os.path.basename(outfile))
 
     def hasmoon(self):
         """
         Return True if the FT2 spacecraft file has the Moon coordinates (using the moonpos user contributed script), False otherwise
         """
-        d = fits.open(self.spacecraft)[1].data
-        try:
-            m = d.field('RA_MOON')
-            r = True
-        except KeyError:
-            r = False
-        return r
+        with fits.open(self.spacecraft, memmap=True) as hdu:
+            return 'RA_MOON' in hdu[1].columns.names
 
     def makeTime(self):
         """
@@ -568,16 +931,12 @@ First, retrieving the last photon files...
         """
         fermi.maketime['scfile'] = self.spacecraft
 
-        if self.daily:
-            fermi.maketime['evfile'] = self.workDir + '/' + str(self.src) + '_daily.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_daily_gti.fits'
-        else:
-            fermi.maketime['evfile'] = self.workDir + '/' + str(self.src) + '.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_gti.fits'
+        fermi.maketime['evfile'] = self._path('.fits')
+        outfile = self._path('_gti.fits')
         fermi.maketime['outfile'] = outfile
 
         # If outfile already exists, we don't do anything
-        if os.path.isfile(outfile):
+        if os.path.basename(outfile) in self._existing:
             return True
 
         # cf. http://fermi.gsfc.nasa.gov/ssc/data/analysis/scitools/aperture_photometry.html
@@ -592,6 +951,7 @@ First, retrieving the last photon files...
         fermi.maketime['tstop'] = self.tstop
         logging.info('Running gtmktime')
         fermi.maketime.run()
+        self._existing.add(os.path.basename(outfile))
 
     def mergeGTIfiles(self):
         """
@@ -601,34 +961,22 @@ First, retrieving the last photon files...
         """
 
         # Create list of GTI files
-        if not self.daily:
-            listname = self.workDir + '/' + self.src + '_gti.list'
-        else:
-            listname = self.workDir + '/' + self.src + '_daily_gti.list'
-        filelist = open(listname, 'w')
-        list = []
-        if not self.daily:
-            for file in glob.glob(self.workDir + '/../20????/' + self.src + '_gti.fits'):
-                list.append(file)
-        else:
-            for file in glob.glob(self.workDir + '/../20????/' + self.src + '_daily_gti.fits'):
-                list.append(file)
-        # Sort the list of GTI files
-        list = sorted(list)
-        for item in list:
-            filelist.write(item + '\n')
-        filelist.close()
+        listname = self._path('_gti.list')
+        outfile = self._path('_gti.fits')
+        # Single sorted glob over the monthly directories, which use the same
+        # per-source naming as workDir
+        paths = sorted(str(p) for p in Path(self.workDir).parent.glob('20????/' + os.path.basename(outfile)))
+        with open(listname, 'w') as filelist:
+            filelist.write('\n'.join(paths))
+            filelist.write('\n')
 
         fermi.filter['infile'] = '@' + listname
-        if not self.daily:
-            outfile = self.workDir + '/' + str(self.src) + '_gti.fits'
-        else:
-            outfile = self.workDir + '/' + str(self.src) + '_daily_gti.fits'
         fermi.filter['outfile'] = outfile
 
         # If outfile already exists, we re-create it
-        if os.path.isfile(outfile):
+        if os.path.basename(outfile) in self._existing:
             os.remove(outfile)
+            self._existing.discard(os.path.basename(outfile))
 
         fermi.filter['ra'] = self.ra
         fermi.filter['dec'] = self.dec
@@ -641,45 +989,39 @@ First, retrieving the last photon files...
         fermi.filter['evclass'] = 128
         logging.info('Running gtselect')
         fermi.filter.run()
+        self._existing.add(os.path.basename(outfile))
 
     def createXML(self):
         """
         Create an XML model file based on the 4FGL catalogue
         """
 
-        if self.daily:
-            evfile = self.workDir + '/' + str(self.src) + '_daily_gti.fits'
-            modelfile = self.workDir + '/' + str(self.src) + '_daily.xml'
-        else:
-            evfile = self.workDir + '/' + str(self.src) + '_gti.fits'
-            modelfile = self.workDir + '/' + str(self.src) + '.xml'
+        evfile = self._path('_gti.fits')
+        modelfile = self._path('.xml')
 
         # If modelfile already exists, we don't do anything
-        if os.path.isfile(modelfile):
+        if os.path.basename(modelfile) in self._existing:
             return True
 
-        import make4FGLxml
+        from flaapluc import make4FGLxml
 
         mymodel = make4FGLxml.srcList(self.catalogFile, evfile, modelfile)
         logging.info('Running makeModel')
         mymodel.makeModel(GDfile=self.fermiDir + '/refdata/fermi/galdiffuse/gll_iem_v07.fits', GDname='GalDiffuse',
                           ISOfile=self.fermiDir + '/refdata/fermi/galdiffuse/iso_P8R3_SOURCE_V2.txt',
                           ISOname='IsotropicDiffuse', extDir=self.templatesDir, makeRegion=False)
+        self._existing.add(os.path.basename(modelfile))
 
     def photoLC(self):
         """
         Compute the photometric light curve for a given source
         """
 
-        if self.daily:
-            fermi.evtbin['evfile'] = self.workDir + '/' + str(self.src) + '_daily_gti.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_daily_lc.fits'
-        else:
-            fermi.evtbin['evfile'] = self.workDir + '/' + str(self.src) + '_gti.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_lc.fits'
+        fermi.evtbin['evfile'] = self._path('_gti.fits')
+        outfile = self._path('_lc.fits')
 
         # If outfile already exists, we don't do anything
-        if os.path.isfile(outfile):
+        if os.path.basename(outfile) in self._existing:
             return True
 
         fermi.evtbin['outfile'] = outfile
@@ -691,6 +1033,7 @@ First, retrieving the last photon files...
         fermi.evtbin['dtime'] = self.tbin
         logging.info('Running gtbin')
         fermi.evtbin.run()
+        self._existing.add(os.path.basename(outfile))
 
     def exposure(self, gamma=None):
         """
@@ -699,36 +1042,41 @@ First, retrieving the last photon files...
         Warning: the input file is modified in place, with an additional exposure column added to the file !
         """
 
-        if self.daily:
-            infile = self.workDir + '/' + str(self.src) + '_daily_lc.fits'
-            srcmdl = self.workDir + '/' + str(self.src) + '_daily.xml'
-        else:
-            infile = self.workDir + '/' + str(self.src) + '_lc.fits'
-            srcmdl = self.workDir + '/' + str(self.src) + '.xml'
+        infile = self._path('_lc.fits')
+        srcmdl = self._path('.xml')
 
-        # If infile already contains an EXPOSURE column, we don't do anything
-        hdu = fits.open(infile)
-        if hdu[1].header.get('TTYPE5') == 'EXPOSURE':
+        # A zero-byte marker dropped next to the LC file once gtexposure has
+        # run lets re-runs skip even the FITS header parse below
+        marker = infile + '.exposure.done'
+        if os.path.basename(marker) in self._existing:
             return True
 
-        scfile = self.spacecraft
-        irfs = 'P8R3_SOURCE_V2'
-        rad = str(self.roi)
+        # If infile already contains an EXPOSURE column, we don't do anything.
+        # Only the header block is read here, not the whole table.
+        if fits.getheader(infile, 1).get('TTYPE5') == 'EXPOSURE':
+            return True
 
-        options = 'infile=' + infile + ' scfile=' + scfile + ' irfs=' + irfs + ' rad=' + rad
+        GTEXPOSURE['infile'] = infile
+        GTEXPOSURE['scfile'] = self.spacecraft
+        GTEXPOSURE['irfs'] = 'P8R3_SOURCE_V2'
+        GTEXPOSURE['rad'] = str(self.roi)
         if self.fglName is not None:
             target = self.fglName.replace('4FGLJ', '4FGL J')
             # Special case for IC component of Crab, which is extended, and which name is replaced by "Crab IC" by make4FGLxml:
             if self.fglName == '4FGLJ0534.5+2201i':
                 target = 'Crab IC'
             logging.debug('exposure: target=%s', target)
-            options += ' srcmdl=' + srcmdl + ' target="' + target + '"'
+            GTEXPOSURE['srcmdl'] = srcmdl
+            GTEXPOSURE['target'] = target
         else:
-            options += ' srcmdl="none" specin=' + str(gamma)
-        cmd = 'time -p gtexposure ' + options
+            GTEXPOSURE['srcmdl'] = 'none'
+            GTEXPOSURE['specin'] = str(gamma)
         logging.info('Running gtexposure')
-        logging.debug('Running gtexposure with command: {cmd}'.format(cmd=cmd))
-        os.system(cmd)
+        t0 = time.time()
+        GTEXPOSURE.run()
+        logging.debug('gtexposure ran in {dt:.1f} s'.format(dt=time.time() - t0))
+        open(marker, 'w').close()
+        self._existing.add(os.path.basename(marker))
 
     def createDAT(self):
         """
@@ -736,91 +1084,97 @@ First, retrieving the last photon files...
         """
 
         # Read LC file
-        if self.daily:
-            infile = self.workDir + '/' + str(self.src) + '_daily_lc.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_daily_lc.dat'
-        else:
-            infile = self.workDir + '/' + str(self.src) + '_lc.fits'
-            outfile = self.workDir + '/' + str(self.src) + '_lc.dat'
+        infile = self._path('_lc.fits')
+        outfile = self._path('_lc.dat')
 
         # If outfile already exists, we don't do anything
-        if os.path.isfile(outfile):
+        if os.path.basename(outfile) in self._existing:
             return True
 
+        # The columns are extracted inside the with block, so the memmap and
+        # its file descriptor are released before the next source is processed
         try:
-            hdu = fits.open(infile)
+            with fits.open(infile, memmap=True) as hdulist:
+                data = hdulist[1].data
+                time = np.asarray(data.field('TIME'))  # MET
+                counts = np.asarray(data.field('COUNTS'))
+                countsErr = np.asarray(data.field('ERROR'))  # error on counts
+                exposure = np.asarray(data.field('EXPOSURE'))  # cm^2 s^1
         except:
             logging.critical('Exception: can not open file %s', infile)
             raise
-        data = hdu[1].data
 
-        file = open(outfile, 'w')
-        file.write("MET\tMJD\tFlux\tFluxError\n")
-        file.write("#[MET]\t[MJD]\t[ph cm^-2 s^-1]\t[ph cm^-2 s^-1]\n")
-        time = data.field('TIME')  # MET
-        counts = data.field('COUNTS')
-        countsErr = data.field('ERROR')  # error on counts
-        exposure = data.field('EXPOSURE')  # cm^2 s^1
-        flux = counts / exposure  # approximate flux in ph cm^-2 s^-1
-        fluxErr = countsErr / exposure  # approximate flux error in ph cm^-2 s^-1
+        # Exposure can be 0 if longTerm=True and TSTOP in photon file > TSTOP in spacecraft file, or if Fermi operated in pointed mode for a while.
+        mask = exposure != 0.
+        time = time[mask]
+        exposure = exposure[mask]
+        flux = counts[mask] / exposure  # approximate flux in ph cm^-2 s^-1
+        fluxErr = countsErr[mask] / exposure  # approximate flux error in ph cm^-2 s^-1
 
         timeMjd = extras.met2mjd(time)
         # We can do this because time is NOT a list, but a numpy.array
 
-        for i in range(len(time)):
-            # Exposure can be 0 if longTerm=True and TSTOP in photon file > TSTOP in spacecraft file, or if Fermi operated in pointed mode for a while.
-            if exposure[i] != 0.:
-                file.write(str(time[i]) + "\t" + str(timeMjd[i]) + "\t" + str(flux[i]) + "\t" + str(fluxErr[i]) + "\n")
+        file = open(outfile, 'w')
+        file.write("MET\tMJD\tFlux\tFluxError\n")
+        file.write("#[MET]\t[MJD]\t[ph cm^-2 s^-1]\t[ph cm^-2 s^-1]\n")
+        # Single vectorized dump instead of one write call per time bin
+        np.savetxt(file, np.column_stack((time, timeMjd, flux, fluxErr)), fmt='%s', delimiter='\t')
         file.close()
+        self._existing.add(os.path.basename(outfile))
 
     def getBAT(self):
-        import urllib2
-
         # daily fits example url:
         # http://swift.gsfc.nasa.gov/docs/swift/results/transients/CygX-3.lc.fits
 
-        # Some sources need replacement names to match the BAT names
-        urls = {
-            '4U1907+09': 'H1907+097',
-            '1FGLJ1018.6-5856': '0FGLJ1018.2-5858',
-            'H1743-322': 'IGRJ17464-3213',
-            'V4641Sgr': 'SAXJ1819.3-2525',
-            '1E1841-04.5': 'Kes73',
-        }
-
         # Remove '+', add file ending
-        if urls.has_key(self.src):
-            file = urls[self.src].replace('+', 'p') + ".lc.fits"
-        else:
-            file = self.src.replace('+', 'p') + ".lc.fits"
+        file = BAT_FILE_MAP.get(self.src) or self.src.replace('+', 'p') + '.lc.fits'
         urlprefix = "http://swift.gsfc.nasa.gov/docs/swift/results/transients/"
 
-        # lc files can be in a weak/ subdir for weak sources, we try both
-        try:
-            baturl = urlprefix + file
-            webfile = urllib2.urlopen(baturl)
-        except (urllib2.HTTPError, urllib2.URLError) as e:
+        # On-disk cache in workDir, keyed by ETag, so that repeated calls on an
+        # unchanged transient skip the download entirely
+        cachefile = self.workDir + '/' + file
+        etagfile = cachefile + '.etag'
+        headers = {}
+        if os.path.isfile(cachefile) and os.path.isfile(etagfile):
+            with open(etagfile) as f:
+                headers['If-None-Match'] = f.read().strip()
+
+        # lc files can be in a weak/ subdir for weak sources, we try both,
+        # starting with whichever URL worked last time for this source
+        urls = [urlprefix + file, urlprefix + 'weak/' + file]
+        known = BAT_URL_CACHE.get(self.src)
+        if known in urls:
+            urls.remove(known)
+            urls.insert(0, known)
+        content = None
+        for baturl in urls:
             try:
-                baturl = urlprefix + 'weak/' + file
-                webfile = urllib2.urlopen(baturl)
-            except (urllib2.HTTPError, urllib2.URLError) as e:
-                return False, None
-            except socket.error:
-                return False, None
-        except socket.error:
+                r = BAT_SESSION.get(baturl, headers=headers, timeout=10)
+            except requests.RequestException:
+                continue
+            if r.status_code == 304:
+                # Not modified, reuse the cached light curve
+                with open(cachefile, 'rb') as f:
+                    content = f.read()
+                BAT_URL_CACHE[self.src] = baturl
+                break
+            if r.ok:
+                content = r.content
+                with open(cachefile, 'wb') as f:
+                    f.write(content)
+                etag = r.headers.get('ETag')
+                if etag is not None:
+                    with open(etagfile, 'w') as f:
+                        f.write(etag)
+                BAT_URL_CACHE[self.src] = baturl
+                break
+        if content is None:
             return False, None
 
-        # save lc to local file
-        localfile = open(file, 'w')
-        localfile.write(webfile.read())
-        webfile.close()
-        localfile.close()
-        # read local file with fits into batlc
-        batfits = fits.open(file)
+        # read the BAT lc with fits into batlc, directly from memory
+        batfits = fits.open(io.BytesIO(content), memmap=False)
         batlc = np.array(batfits[1].data)
         batfits.close()
-        # delete local file
-        os.unlink(file)
 
         return True, batlc
 
@@ -830,28 +1184,19 @@ First, retrieving the last photon files...
         """
 
         # Read the .dat LC file
+        infile = self._path('_lc.dat')
+        outfig = self._path('_lc.png')
         if self.daily:
-            infile = self.workDir + '/' + str(self.src) + '_daily_lc.dat'
-            outfig = self.workDir + '/' + str(self.src) + '_daily_lc.png'
-            infileLongTimeBin = self.workDir + '/' + str(self.src) + '_lc.dat'
+            infileLongTimeBin = self._path('_lc.dat', daily=False)
             duration = 1.  # duration of a time bin, in days
         else:
-            infile = self.workDir + '/' + str(self.src) + '_lc.dat'
-            outfig = self.workDir + '/' + str(self.src) + '_lc.png'
             duration = self.longtimebin  # duration of a time bin, in days
 
-        data = ascii.read(infile)
         # the times are already read as MJD, cf createDAT function.
-        timelc = data['MJD']
-        flux = data['Flux']
-        fluxErr = data['FluxError']
+        _, timelc, flux, fluxErr = self._load_lc(infile)
 
         if self.daily:
-            dataLongTimeBin = ascii.read(infileLongTimeBin)
-            # the times are already read as MJD, cf createDAT function.
-            timeLongTimeBin = dataLongTimeBin['MJD']
-            fluxLongTimeBin = dataLongTimeBin['Flux']
-            fluxErrLongTimeBin = dataLongTimeBin['FluxError']
+            _, timeLongTimeBin, fluxLongTimeBin, fluxErrLongTimeBin = self._load_lc(infileLongTimeBin)
             durationLongTimeBin = self.longtimebin  # duration of a time bin, in days
 
         # Download Swift/BAT data if available
@@ -885,12 +1230,12 @@ First, retrieving the last photon files...
         ax.set_title(title)
 
         # Force the y-axis ticks to use 1e-6 as a base exponent
-        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, pos: ('%.2f') % (x * 1e6)))
+        ax.yaxis.set_major_formatter(FLUX_TICK_FORMATTER)
         ax.set_ylabel('F (%.0f MeV-%.0f GeV) (%s 10$^{-6}$ ph cm$^{-2}$ s$^{-1}$)' % (
         self.emin, self.emax / 1000., r'$\times$'))  # , size='x-small')
 
         ## Make the x-axis ticks shifted by some value
-        ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: '%.0f' % (x - TOFFSET)))
+        ax.xaxis.set_major_formatter(MJD_TICK_FORMATTER)
         ax.set_xlabel('MJD-' + str(TOFFSET))
         # ax.set_xlabel('MJD')
 
@@ -904,20 +1249,29 @@ First, retrieving the last photon files...
         else:
             ax.errorbar(x=timelc, xerr=duration / 2., y=flux, yerr=fluxErr, fmt='bo')
 
-        # Plot a line at the threshold value
-        ax.axhline(y=self.threshold, linewidth=3, linestyle='--', color='r')
+        # Plot lines at the threshold value, at flux=0 (for visibility/readibility),
+        # and optionally at the long-term average flux +/- its RMS, with a single
+        # LineCollection instead of one axhline call each
+        xmin = timelc[0] - duration / 2.
+        xmax = timelc[-1] + duration / 2.
+        if self.daily:
+            xmin = min(xmin, timeLongTimeBin[0] - durationLongTimeBin / 2.)
+            xmax = max(xmax, timeLongTimeBin[-1] + durationLongTimeBin / 2.)
+        guides = [self.threshold, 0.]
+        guidecolors = ['r', 'k']
+        guidestyles = ['--', '-']
+        guidewidths = [3., 1.]
         if self.withhistory:
-            ax.axhline(y=self.LTfluxAverage, linewidth=1, linestyle='-', color='b')
-            ax.axhline(y=self.LTfluxAverage + self.LTfluxRMS, linewidth=1, linestyle='--', color='b')
-            ax.axhline(y=self.LTfluxAverage - self.LTfluxRMS, linewidth=1, linestyle='--', color='b')
-
-        # Plot a line at flux=0, for visibility/readibility
-        ax.axhline(y=0., color='k')
+            guides += [self.LTfluxAverage, self.LTfluxAverage + self.LTfluxRMS, self.LTfluxAverage - self.LTfluxRMS]
+            guidecolors += ['b', 'b', 'b']
+            guidestyles += ['-', '--', '--']
+            guidewidths += [1., 1., 1.]
+        ax.hlines(guides, xmin, xmax, colors=guidecolors, linestyles=guidestyles, linewidths=guidewidths)
 
         # Add a label for the creation date of this figure
         # x,y in relative 0-1 coords in figure
         plt.figtext(0.98, 0.95,
-                    'plot creation date: %s (UTC)' % (time.strftime("%a, %d %b %Y %H:%M:%S", time.gmtime())),
+                    'plot creation date: %s (UTC)' % _CREATION_STAMP,
                     horizontalalignment="right",
                     rotation='vertical',
                     size='xx-small'
@@ -937,12 +1291,9 @@ First, retrieving the last photon files...
                 pass
 
         # Need to zoom in or not, at the very end, after any call to other matplotlib functions
-        NEEDTOZOOMIN = False
-        for i in range(len(flux)):
-            if fluxErr[i] > 5. * flux[i]:
-                NEEDTOZOOMIN = True
+        NEEDTOZOOMIN = bool(np.any(fluxErr > 5. * flux))
         if NEEDTOZOOMIN:
-            maxy = 1.5 * max(flux)
+            maxy = 1.5 * flux.max()
             if maxy > self.threshold:
                 ax.set_ylim(ymin=-1.e-7, ymax=maxy)
             else:
@@ -964,17 +1315,19 @@ First, retrieving the last photon files...
         infile = self.workDir + '/' + str(self.src) + '_gti.fits'
         outfig = self.workDir + '/' + str(self.src) + '_energyTime.png'
 
-        hdu = fits.open(infile)
-        data = hdu[1].data
-        mask = data.field('ENERGY') > eThresh
-        datac = data[mask]
-        if not datac.size:
+        # Pull only the two columns we need out of the memmap, as plain float
+        # arrays: masking them copies far less than slicing the whole FITS
+        # record array, and the file pages can be evicted right away
+        with fits.open(infile, memmap=True) as hdu:
+            tbl = hdu[1].data
+            energy = np.asarray(tbl['ENERGY'], dtype=np.float64)
+            tmask = energy > eThresh
+            e = energy[tmask]
+            t = extras.met2mjd(np.asarray(tbl['TIME'], dtype=np.float64)[tmask])
+        if not e.size:
             logging.warning('[{src:s}] \033[92mEmpty energy vs time plot above {eth:0.2f} GeV\033[0m'.format(src=self.src, eth=eThresh/1.e3))
             return
 
-        t = extras.met2mjd(datac['TIME'])
-        e = datac['ENERGY']
-
         fig = plt.figure()
         ax = fig.add_subplot(111)
 
@@ -996,7 +1349,7 @@ First, retrieving the last photon files...
         ax.set_ylabel(ylabel)
 
         ## Make the x-axis ticks shifted by some value
-        ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: '%.0f' % (x - TOFFSET)))
+        ax.xaxis.set_major_formatter(MJD_TICK_FORMATTER)
         ax.set_xlabel('MJD-' + str(TOFFSET))
         try:
             ax.set_xlim(xmin=t[0] - 1., xmax=t[-1:] + 1.)
@@ -1004,11 +1357,10 @@ First, retrieving the last photon files...
             pass
 
         # Plot the energy vs time distribution
-        try:
+        if HAS_SCIPY:
             # cf. http://stackoverflow.com/questions/20105364/how-can-i-make-a-scatter-plot-colored-by-density-in-matplotlib
-            from scipy.stats import gaussian_kde
-            xy = np.vstack([t, e])
-            z = gaussian_kde(xy)(xy)
+            # The KDE runs in log-energy, the same space the plot displays
+            grid, extents, z = fast_kde(t, np.log10(e), gridsize=(400, 400), sample=True)
             # Re-normalize the density
             z = z / max(z)
             idx = z.argsort()
@@ -1016,14 +1368,14 @@ First, retrieving the last photon files...
             pcm = ax.scatter(t, e, c=z, s=100, edgecolor='')
             cbar = plt.colorbar(pcm, ax=ax)
             cbar.set_label('Kernel-density estimates (arb. unit)', rotation=90)
-        except ImportError:
+        else:
             ax.plot(t, e, 'bo')
         ax.set_yscale('log')
 
         # Add a label for the creation date of this figure
         # x,y in relative 0-1 coords in figure
         plt.figtext(0.98, 0.95,
-                    'plot creation date: %s (UTC)' % (time.strftime("%a, %d %b %Y %H:%M:%S", time.gmtime())),
+                    'plot creation date: %s (UTC)' % _CREATION_STAMP,
                     horizontalalignment="right",
                     rotation='vertical',
                     size='xx-small'
@@ -1084,12 +1436,8 @@ First, retrieving the last photon files...
         srcCoords = c.SkyCoord(ra=self.ra * u.degree, dec=self.dec * u.degree, frame='icrs')
         altaz = srcCoords.transform_to(horizframe)
 
-        obs = ephem.Observer()
-        moonHorizon = ephem.degrees(str(MOON_TWILIGHT_ANGLE.value))  # Moon twilight angle to -0.83°
-        obs.lon = ephem.degrees(str(self.siteLon))  # ephem needs this as string
-        obs.lat = ephem.degrees(str(self.siteLat))  # ephem needs this as string
-        obs.elev = self.siteAlt
-        obs.compute_pressure()
+        # Reuse the pyephem site built in __init__
+        obs = self.ephemSite
 
         moon = ephem.Moon()
         moon_alts = np.zeros_like(times)
@@ -1152,7 +1500,7 @@ First, retrieving the last photon files...
         # Add a label for the creation date of this figure
         # x,y in relative 0-1 coords in figure
         plt.figtext(0.98, 0.95,
-                    'plot creation date: %s (UTC)' % (time.strftime("%a, %d %b %Y %H:%M:%S", time.gmtime())),
+                    'plot creation date: %s (UTC)' % _CREATION_STAMP,
                     horizontalalignment="right",
                     rotation='vertical',
                     size='xx-small')
@@ -1188,53 +1536,75 @@ First, retrieving the last photon files...
     def zaAtCulmination(self):
         """
         Returns the zenith angle of a source at culmination, for the provided site.
+
+        It only depends on the source declination and the site latitude, so
+        it is computed once per instance and cached.
+        """
+        try:
+            return self._zaAtCulmin
+        except AttributeError:
+            self._zaAtCulmin = np.abs(self.dec - self.siteLat)
+            return self._zaAtCulmin
+
+    def effectiveRedshift(self):
         """
-        za = np.abs(self.dec - self.siteLat)
-        return za
+        Returns the source redshift as a float, with an unknown redshift
+        ('None' in the master list) mapped to 0.
+
+        The string test and conversion are done once per instance and cached,
+        instead of being redone by every is_visible/killTrigger call.
+        """
+        try:
+            return self._zEff
+        except AttributeError:
+            if self.z == 'None':
+                logging.warning('[{src:s}] \033[93mUnknown z, taking z=0.\033[0m'.format(src=self.src))
+                self._zEff = 0.
+            else:
+                self._zEff = float(self.z)
+            return self._zEff
 
     def is_visible(self):
         '''
         Check whether the current source is visible at the site provided.
         '''
 
-        # Define site for pyephem
-        site = ephem.Observer()
-        astroHorizon = ephem.degrees(str(ASTRONOMICAL_TWILIGHT_ANGLE.value))  # astronomical twilight
-        moonHorizon = ephem.degrees(str(MOON_TWILIGHT_ANGLE.value))  # Moon twilight angle to -0.83°
+        # Reuse the pyephem site built in __init__
+        site = self.ephemSite
+        astroHorizon = ASTRO_HORIZON  # astronomical twilight
+        moonHorizon = MOON_HORIZON  # Moon twilight angle to -0.83°
         site.horizon = astroHorizon
-        site.lon = ephem.degrees(str(self.siteLon))  # ephem needs this as string
-        site.lat = ephem.degrees(str(self.siteLat))  # ephem needs this as string
-        site.elev = self.siteAlt  # meters
-        site.compute_pressure()
-
-        srcCoords = c.SkyCoord(ra=self.ra * u.degree, dec=self.dec * u.degree, frame='icrs')
 
-        # If input z is None, make it believe it is 0, otherwise msk crashes:
-        if self.z == 'None':
-            z = 0.
-            logging.warning('[{src:s}] \033[93mUnknown z, taking z=0.\033[0m'.format(src=self.src))
-        else:
-            z = float(self.z)
+        # If input z is None, effectiveRedshift maps it to 0, otherwise msk crashes
+        z = self.effectiveRedshift()
 
         # We also want the max allowed ZA for the given z of the source
-        maxz = np.array(self.maxz)
-        maxZA = np.array(self.maxZA)
+        maxz = self.maxz
+        maxZA = self.maxZA
         if z > np.max(maxz):
             thismaxZA = np.min(maxZA)
             logging.warning('[{src}] \033[93mz={z} is greater than max probed z={maxz} !\033[0m'.format(src=self.src, z=z, maxz=np.max(maxz)))
         else:
-            msk = np.where(z < maxz)
-            # Get the first item in the mask, to get the corresponding ZA:
-            thismaxZA = maxZA[msk[0][0]]
-            thismaxz = maxz[msk[0][0]]
+            # Get the first acceptable entry, to get the corresponding ZA
+            # (maxz is sorted by increasing z since __init__):
+            idx = np.searchsorted(maxz, z, side='right')
+            thismaxZA = maxZA[idx]
+            thismaxz = maxz[idx]
 
         # Convert ZA to Alt
         self.srcMinAlt = np.abs(90. - thismaxZA)
 
-        ephemSrc = ephem.FixedBody()
-        ephemSrc._ra = ephem.hours(str(srcCoords.ra.to_string(unit=u.hourangle,
-                                                              sep=':')))  # Careful: ephem should be given hours here, but only for RA !
-        ephemSrc._dec = ephem.degrees(str(srcCoords.dec.to_string(unit=u.degree, sep=':')))
+        # The FixedBody only depends on the source coordinates, so it is
+        # built once per instance and reused on subsequent calls
+        try:
+            ephemSrc = self._ephemSrc
+        except AttributeError:
+            ephemSrc = ephem.FixedBody()
+            # pyephem accepts plain floats in radians directly, no need to go
+            # through sexagesimal strings which it would only parse back
+            ephemSrc._ra = np.radians(self.ra)
+            ephemSrc._dec = np.radians(self.dec)
+            self._ephemSrc = ephemSrc
 
         visibleFlag = False
 
@@ -1255,30 +1625,42 @@ First, retrieving the last photon files...
             site.date = ephem.Date(self.stopday.replace('-','/')+' 12:00:00')
         else:
             site.date = datetime.datetime.utcnow()
-        sun = ephem.Sun()
-        sun.compute(site)
-        nextSunset = site.next_setting(sun)
-        nextSunrise = site.next_rising(sun)
-        # so far, so good. All of this is OK if we execute the program during day time.
-
-        # However, if the program is run during dark time, we should look at the ephemerids of next night (not current night):
-        if nextSunrise < nextSunset:
-            logging.info('Looking at visibility for tomorrow')
-            # we just put the current time at next sunrise + 10 min., to be sure to fall on tomorrow's morning day time
-            site.date = nextSunrise.datetime() + datetime.timedelta(minutes=10)
+        # The Sun/Moon rise and set events are the same for every source of a
+        # batch run, so they are computed once per (site, date) and cached at
+        # class level.
+        nightkey = (self.siteLon, self.siteLat, self.siteAlt, int(float(ephem.Date(site.date)) * 24. * 60.))
+        night = automaticLightCurve._nightCache.get(nightkey)
+        if night is None:
+            sun = ephem.Sun()
             sun.compute(site)
             nextSunset = site.next_setting(sun)
             nextSunrise = site.next_rising(sun)
+            # so far, so good. All of this is OK if we execute the program during day time.
+
+            # However, if the program is run during dark time, we should look at the ephemerids of next night (not current night):
+            if nextSunrise < nextSunset:
+                logging.info('Looking at visibility for tomorrow')
+                # we just put the current time at next sunrise + 10 min., to be sure to fall on tomorrow's morning day time
+                site.date = nextSunrise.datetime() + datetime.timedelta(minutes=10)
+                sun.compute(site)
+                nextSunset = site.next_setting(sun)
+                nextSunrise = site.next_rising(sun)
+
+            # The Moon just needs to be below the horizon, not below astronomical twilight angle
+            site.horizon = moonHorizon
+            moon = ephem.Moon()
+            moon.compute(site)
+            nextMoonset = site.next_setting(moon)
+            nextMoonrise = site.next_rising(moon)
+            site.horizon = astroHorizon
+            automaticLightCurve._nightCache[nightkey] = (site.date, nextSunset, nextSunrise, nextMoonset, nextMoonrise)
+        else:
+            site.date, nextSunset, nextSunrise, nextMoonset, nextMoonrise = night
 
         logging.debug('[is_visible] Date is set to {date}'.format(date=site.date))
 
-        # The Moon just needs to be below the horizon, not below astronomical twilight angle
-        site.horizon = moonHorizon
         moon = ephem.Moon()
         moon.compute(site)
-        nextMoonset = site.next_setting(moon)
-        nextMoonrise = site.next_rising(moon)
-        site.horizon = astroHorizon
 
         logging.debug('[is_visible] Next sun rise at {0}'.format(nextSunrise))
         logging.debug('[is_visible] Next sun set at {0}'.format(nextSunset))
@@ -1287,7 +1669,7 @@ First, retrieving the last photon files...
 
         ephemSrc.compute(site)
         moonPhase = moon.phase  # phase of the Moon between 0 and 100
-        targetMoonSeparation = c.Angle(ephem.separation(ephemSrc, moon), unit=u.rad).degree  # ephem computes angles in radians !!
+        targetMoonSeparation = np.degrees(float(ephem.separation(ephemSrc, moon)))  # ephem computes angles in radians !!
         logging.debug('[is_visible] Moon phase is {phase:.1f}% and the Moon/{src} separation is {sep:.1f}°'.format(phase=moonPhase, src=self.src, sep=targetMoonSeparation))
 
         # Add criteria on Moon phase and Moon/target separation
@@ -1298,7 +1680,7 @@ First, retrieving the last photon files...
         srcTransitTime = site.next_transit(ephemSrc)
         site.date = srcTransitTime
         ephemSrc.compute(site)
-        srcAltAtTransit = c.Angle(ephemSrc.alt, unit=u.rad).degree
+        srcAltAtTransit = np.degrees(float(ephemSrc.alt))
 
         # If srcAltAtTransit is below self.srcMinAlt, the source is just not optimally visible and we stop here
         logging.debug('[is_visible] Acceptable minimium altitude for {src}: {alt:.1f}°'.format(src=self.src, alt=self.srcMinAlt))
@@ -1317,29 +1699,28 @@ First, retrieving the last photon files...
         else:
             endDarkness = nextSunrise
 
-        site.date = beginDarkness
-        ephemSrc.compute(site)
-        srcAltAtStartDarkTime = c.Angle(ephemSrc.alt, unit=u.rad).degree
-
-        site.date = endDarkness
-        ephemSrc.compute(site)
-        srcAltAtEndDarkTime = c.Angle(ephemSrc.alt, unit=u.rad).degree
-
         darknessDuration = (endDarkness - beginDarkness) * 24. * 60.  # day to minutes
         logging.debug('[is_visible] Darkness begins at {0}'.format(beginDarkness))
         logging.debug('[is_visible] Darkness ends at {0}'.format(endDarkness))
         logging.debug('[is_visible] Darkness duration: {0:.1f} minutes'.format(darknessDuration))
-        logging.debug('[is_visible] {src} altitude at beginning of darkness: {alt:.1f}°'.format(src=self.src, alt=srcAltAtStartDarkTime))
         logging.debug('[is_visible] {src} transitting on {transit} at an altitude of {alt:.1f}°'.format(src=self.src, transit=srcTransitTime, alt=srcAltAtTransit))
-        logging.debug('[is_visible] {src} altitude at end of darkness: {alt:.1f}°'.format(src=self.src, alt=srcAltAtEndDarkTime))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            # The source altitudes at the edges of darkness are only quoted in
+            # the debug logs, don't pay for the two extra ephemeris probes otherwise
+            site.date = beginDarkness
+            ephemSrc.compute(site)
+            logging.debug('[is_visible] {src} altitude at beginning of darkness: {alt:.1f}°'.format(src=self.src, alt=np.degrees(float(ephemSrc.alt))))
+            site.date = endDarkness
+            ephemSrc.compute(site)
+            logging.debug('[is_visible] {src} altitude at end of darkness: {alt:.1f}°'.format(src=self.src, alt=np.degrees(float(ephemSrc.alt))))
 
         # check if source is visible, above minAlt, during this night
-        for step in range(0, np.int(darknessDuration)):
+        for step in range(0, int(darknessDuration)):
             site.date = beginDarkness.datetime() + datetime.timedelta(minutes=step)
             ephemSrc.compute(site)
-            srcAlt = c.Angle(ephemSrc.alt, unit=u.rad).degree
+            srcAlt = np.degrees(float(ephemSrc.alt))
             moon.compute(site)
-            moonAlt = c.Angle(moon.alt, unit=u.rad).degree
+            moonAlt = np.degrees(float(moon.alt))
             moonUp = moonAlt > MOON_TWILIGHT_ANGLE.value
             # logging.debug('[is_visible] Time loop: It is now {now} and {src} is at alt. of {alt:.2f}°. Moon is {isup} at alt. of {moonAlt:.1f}°'.format(now=site.date,
             #                                                                                                                       src=self.src,
@@ -1378,32 +1759,25 @@ First, retrieving the last photon files...
         The 'return' value is a bit counter-intuitive. It answers the question 'Should we kill an imminent mail alert ?', i.e. if a source has the last flux point above the flux threshold, does it also fulfill the requirements on both z (not too far away) and zenith angle (not too low in the sky) ? So if an alert should definitely be sent, this function returns 'False' !
         """
 
-        # Numpy array
-        # combination of acceptable
-        #                           z         ZA@culmination
-        grid = np.array(zip(self.maxz, self.maxZA))
-
-        zaAtCulmin = self.zaAtCulmination()
-
-        # If input z is None, make it believe it is 0, otherwise msk crashes:
-        if self.z == 'None':
-            z = 0.
-        else:
-            z = float(self.z)
-
-        # Mask on both (z, ZA at culmin)
-        #          z column               ZA column
-        msk = (z <= grid[:, 0]) & (zaAtCulmin <= grid[:, 1])
-
         # Assess whether the source is currently visible at the provided site
-        if self.checkVisibility == 'True':
+        if self.checkVisibility:
             self.visible = self.is_visible()
         else:
             # The source is assumed to be visible in any case, i.e. we don't care about its visibility status at the provided site to send a potential alert
             self.visible = True
+        if not self.visible:
+            # No alert triggered
+            return True
+
+        # Mask on both (z, ZA at culmin); maxz and maxZA are kept as numpy
+        # arrays since __init__, and the two comparisons are combined into
+        # the first one's buffer, sparing a temporary per call.
+        # If input z is None, effectiveRedshift maps it to 0, otherwise msk crashes
+        msk = np.less_equal(self.effectiveRedshift(), self.maxz)
+        np.logical_and(msk, np.less_equal(self.zaAtCulmination(), self.maxZA), out=msk)
 
         # if the mask has at least one 'True' element, we should send an alert
-        if True in msk and self.visible:
+        if msk.any():
             # An alert should be triggered !
             return False
         else:
@@ -1415,20 +1789,43 @@ First, retrieving the last photon files...
         If long-term data are available for a source, dynamically computes a flux trigger threshold based on the flux history of the source. Otherwise, fall back with default fixed trigger threshold.
         '''
 
-        # Read the longterm .dat LC file
+        # The long-term statistics do not change within a run: reuse them if
+        # they have already been computed for this instance
+        if self._dyn_cache is not None:
+            self.LTfluxAverage, self.LTfluxRMS = self._dyn_cache
+            if self.daily:
+                self.threshold = self.LTfluxAverage + self.sigma * self.LTfluxRMS
+            else:
+                self.threshold = self.LTfluxAverage + self.sigmaLT * self.LTfluxRMS
+            return
+
+        # Read the longterm .dat LC file, straight into numpy arrays.
+        # A binary .npy sidecar caches the parsed columns: when it is at least
+        # as recent as the ASCII file, reloading it is essentially free
+        # compared to re-parsing the text on every run.
         infile = self.baseOutDir + '/longTerm/merged/' + str(self.src) + '_lc.dat'
+        npyfile = infile.replace('.dat', '.npy')
+        flux = fluxErr = None
         try:
-            data = ascii.read(infile)
-        except IOError:
-            logging.error('[{src:s}] \033[95m* Long term data file unavailable for source {src:s}\033[0m'.format(src=self.src))
-            # Falling back to default fixed trigger threshold
-            self.withhistory = False
-            self.LTfluxAverage = self.threshold
-            self.LTfluxRMS = 0.
-            return None
-
-        flux = data['Flux']
-        fluxErr = data['FluxError']
+            if os.path.getmtime(npyfile) >= os.path.getmtime(infile):
+                flux, fluxErr = np.load(npyfile)
+        except (IOError, OSError, ValueError):
+            # Missing or stale sidecar, fall through to the ASCII parse
+            pass
+        if flux is None:
+            try:
+                flux, fluxErr = np.loadtxt(infile, skiprows=1, usecols=(2, 3), unpack=True, ndmin=2)
+            except IOError:
+                logging.error('[{src:s}] \033[95m* Long term data file unavailable for source {src:s}\033[0m'.format(src=self.src))
+                # Falling back to default fixed trigger threshold
+                self.withhistory = False
+                self.LTfluxAverage = self.threshold
+                self.LTfluxRMS = 0.
+                return None
+            try:
+                np.save(npyfile, np.vstack((flux, fluxErr)))
+            except IOError:
+                pass
         try:
             from uncertainties import unumpy as unp
             logging.info('[{src:s}] The long-term flux average is {f} ph cm^-2 s^-1'.format(src=self.src, f=unp.uarray(flux, fluxErr).mean()))
@@ -1436,10 +1833,16 @@ First, retrieving the last photon files...
             logging.debug('Cannot use uncertainties...')
             pass
 
-        # weighted average of the historical fluxes, weighted by their errors
+        # weighted average of the historical fluxes, with the proper
+        # inverse-variance weights 1/sigma^2. The where= mask keeps points
+        # with a null error out of the average instead of silently producing
+        # an infinite weight
         try:
-            self.LTfluxAverage = np.average(flux, weights=1. / fluxErr)
+            var = fluxErr * fluxErr
+            weights = np.reciprocal(var, where=var > 0., out=np.zeros_like(var))
+            self.LTfluxAverage = np.average(flux, weights=weights)
             self.LTfluxRMS = np.std(flux, dtype=np.float64)
+            self._dyn_cache = (self.LTfluxAverage, self.LTfluxRMS)
         except ZeroDivisionError:
             logging.error('[{src:s}] \033[95m* Zero division error for computation of long term flux average for source {src:s}\033[0m'.format(src=self.src))
             self.withhistory = False
@@ -1469,44 +1872,29 @@ First, retrieving the last photon files...
 
             # Also take a look in the long time-binned data
             infileLongTimeBin = self.workDir + '/' + str(self.src) + '_lc.dat'
-            dataLongTimeBin = ascii.read(infileLongTimeBin)
-            timeLongTimeBin = dataLongTimeBin['MET']
-            fluxLongTimeBin = dataLongTimeBin['Flux']
-            fluxErrLongTimeBin = dataLongTimeBin['FluxError']
-            # Catch the last flux point
-            self.lastTimeLongTimeBin = timeLongTimeBin[-1:]
-            self.lastFluxLongTimeBin = fluxLongTimeBin[-1:]
-            self.lastFluxErrLongTimeBin = fluxErrLongTimeBin[-1:]
-
-            # Get the arrival time of the last photon analysed
-            photonfileLongTimeBin = self.workDir + '/' + str(self.src) + '_gti.fits'
-            photonsLongTimeBin = fits.open(photonfileLongTimeBin)
-            photonsLongTimeBinTime = photonsLongTimeBin[1].data.field('TIME')
-            self.arrivalTimeLastPhotonLongTimeBin = photonsLongTimeBinTime[-1:]
-
-            photonfile = self.workDir + '/' + str(self.src) + '_daily_gti.fits'
-            photons = fits.open(photonfile)
-            photonsTime = photons[1].data.field('TIME')
-            self.arrivalTimeLastPhoton = photonsTime[-1:]
+            timeLongTimeBin, _, fluxLongTimeBin, fluxErrLongTimeBin = self._load_lc(infileLongTimeBin)
+            # Catch the last flux point, as plain scalars
+            self.lastTimeLongTimeBin = timeLongTimeBin[-1]
+            self.lastFluxLongTimeBin = fluxLongTimeBin[-1]
+            self.lastFluxErrLongTimeBin = fluxErrLongTimeBin[-1]
         else:
             infile = self.workDir + '/' + str(self.src) + '_lc.dat'
             infilefits = self.workDir + '/' + str(self.src) + '_lc.fits'
             self.pngFig = self.workDir + '/' + str(self.src) + '_lc.png'
+        time, _, flux, fluxErr = self._load_lc(infile)
 
-            photonfile = self.workDir + '/' + str(self.src) + '_gti.fits'
-            photons = fits.open(photonfile)
-            photonsTime = photons[1].data.field('TIME')
-            self.arrivalTimeLastPhoton = photonsTime[-1:]
-        data = ascii.read(infile)
-        time = data['MET']
-        flux = data['Flux']
-        fluxErr = data['FluxError']
-        self.lastExposure = float(fits.open(infilefits)['RATE'].data.field('EXPOSURE')[-1:])
-
-        # Catch the last flux point
-        self.lastTime = time[-1:]
-        self.lastFlux = flux[-1:]
-        self.lastFluxErr = fluxErr[-1:]
+        # Catch the last flux point, as plain scalars
+        self.lastTime = time[-1]
+        self.lastFlux = flux[-1]
+        self.lastFluxErr = fluxErr[-1]
+
+        # Redefine the trigger threshold if withhistory=True; otherwise the
+        # long-term statistics fall back on the fixed threshold
+        if self.withhistory:
+            self.dynamicalTrigger()
+        else:
+            self.LTfluxAverage = self.threshold
+            self.LTfluxRMS = 0.
 
         self.energyTimeFig = self.workDir + '/' + str(self.src) + '_energyTime.png'
 
@@ -1521,6 +1909,10 @@ First, retrieving the last photon files...
         # Assess whether flux is above threshold, looking at the last flux point and at the exposure of the last flux measurement
         if self.lastFlux >= self.LTfluxAverage + self.sigma * np.sqrt(self.LTfluxRMS**2 + self.lastFluxErr**2):
             self.active = True
+            # Only now is the exposure of the last flux measurement needed,
+            # to confirm or kill the potential trigger
+            with fits.open(infilefits, memmap=True) as lcfits:
+                self.lastExposure = float(lcfits['RATE'].data['EXPOSURE'][-1])
             if self.lastExposure < self.lowerExposure:
                 self.active = False
                 logging.warning('[{src}] \033[93mPotential trigger killed due to low exposure: last exposure is {lastExp:.2g} cm^2 s versus cutting on the exposure at {lowExp:.2g} cm^2 s.\033[0m'.format(src=self.src, lastExp=self.lastExposure, lowExp=self.lowerExposure))
@@ -1532,6 +1924,18 @@ First, retrieving the last photon files...
         if ((not self.triggerkilled and self.active) or self.forcealert or self.too) is True:
             SENDALERT = True
 
+        if SENDALERT:
+            # The arrival time of the last photon analysed is only quoted in
+            # the alert mail, so it is fetched only once we know an alert goes
+            # out. Only the last photon time is needed: fetch it through a
+            # memmap instead of materializing the whole TIME column
+            with fits.open(self._path('_gti.fits'), memmap=True) as photons:
+                self.arrivalTimeLastPhoton = float(photons[1].data['TIME'][-1])
+            if self.daily:
+                # Also take a look in the long time-binned data
+                with fits.open(self._path('_gti.fits', daily=False), memmap=True) as photonsLongTimeBin:
+                    self.arrivalTimeLastPhotonLongTimeBin = float(photonsLongTimeBin[1].data['TIME'][-1])
+
         logging.debug('[{src}] dec={dec}, z={z}, maxZA={za}, maxz={maxz}, active={active}, visible={visible}, triggerkilled={kill}, sendalert={send}, too={too}, forcealert={forcealert}'.format(src=self.src,
                                                                                                                                                                                                  dec=self.dec,
                                                                                                                                                                                                  z=self.z,
@@ -1554,25 +1958,16 @@ First, retrieving the last photon files...
         @rtype bool
         '''
 
-        # Import modules
-        try:
-            # Import smtplib to send mails
-            import smtplib
-
-            # Here are the email package modules we'll need
-            from email.MIMEMultipart import MIMEMultipart
-            from email.MIMEText import MIMEText
-            from email.MIMEBase import MIMEBase
-            from email import Encoders
-
-        except:
-            logging.error('sendAlert: Can\'t import mail modules.')
-            sys.exit(1)
-
         SENDALERT = self.Triggered()
 
         # If trigger condition is met, we send a mail
         if SENDALERT and sendmail:
+            # The figures are only needed as attachments of this very mail:
+            # render them on demand, so that the many non-triggering sources
+            # of a batch run skip the matplotlib work entirely
+            self.createLCfig()
+            self.createEnergyTimeFig()
+
             # Create the container email message.
             msg = MIMEMultipart()
             sender = self.mailSender
@@ -1617,85 +2012,55 @@ First, retrieving the last photon files...
                 else:
                     stateinfo="*does not* exceed"
 
-            mailtext = """
-     FLaapLUC (Fermi/LAT automatic aperture photometry Light C<->Urve) report
-
-     *** The Fermi/LAT flux (%.0f MeV-%.0f GeV) of %s (%s, %s) %s the trigger threshold of %.2g ph cm^-2 s^-1 ***
-
-     Source coordinates (RA, Dec): %f %f
-
-     """ % (self.emin, self.emax / 1000., self.src, fhlmessage, fglmessage, stateinfo, self.threshold, self.ra, self.dec)
-
+            mailparts = [MAIL_REPORT_TPL % (self.emin, self.emax / 1000., self.src, fhlmessage, fglmessage, stateinfo,
+                                            self.threshold, self.ra, self.dec)]
 
+            # Convert all the times quoted in the mail in one vectorized
+            # met2mjd call, instead of one scalar call per quoted field
             if self.daily:
-                mailtext = mailtext + """
-
-     The last daily-binned flux is:        %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: MET %.0f, MJD %.5f, %s)
-     and the last %.0f-day binned flux is: %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: MET %.0f, MJD %.5f, %s)
-
-""" % (self.lastFlux,
-       self.lastFluxErr,
-       self.lastTime, extras.met2mjd(self.lastTime), str(extras.mjd2gd(extras.met2mjd(self.lastTime))),
-       self.arrivalTimeLastPhoton, extras.met2mjd(self.arrivalTimeLastPhoton),
-       str(extras.mjd2gd(extras.met2mjd(self.arrivalTimeLastPhoton))),
-       self.longtimebin,
-       self.lastFluxLongTimeBin,
-       self.lastFluxErrLongTimeBin,
-       self.lastTimeLongTimeBin, extras.met2mjd(self.lastTimeLongTimeBin),
-       str(extras.mjd2gd(extras.met2mjd(self.lastTimeLongTimeBin))),
-       self.arrivalTimeLastPhotonLongTimeBin, extras.met2mjd(self.arrivalTimeLastPhotonLongTimeBin),
-       str(extras.mjd2gd(extras.met2mjd(self.arrivalTimeLastPhotonLongTimeBin))))
-                mailtext = mailtext + "The most recent lightcurve (%.0f-day binned in red, and %.0f-day binned in blue) is attached." % (
-                self.tbin / 24. / 60. / 60., self.longtimebin)
+                mets = (self.lastTime, self.arrivalTimeLastPhoton,
+                        self.lastTimeLongTimeBin, self.arrivalTimeLastPhotonLongTimeBin)
             else:
-                mailtext = mailtext + """
-
-     The last %.0f-day binned flux is:      %.2g +/- %.2g ph cm^-2 s^-1, centred on MET %.0f (MJD %.5f, i.e. %s) (arrival time of last photon analysed: %.0f, MJD %.5f, %s)
+                mets = (self.lastTime, self.arrivalTimeLastPhoton)
+            mjds = extras.met2mjd(np.asarray(mets, dtype=np.float64))
+            gds = [str(extras.mjd2gd(mjd)) for mjd in mjds]
 
-""" % (self.longtimebin,
-       self.lastFlux,
-       self.lastFluxErr,
-       self.lastTime, extras.met2mjd(self.lastTime), str(extras.mjd2gd(extras.met2mjd(self.lastTime))),
-       self.arrivalTimeLastPhoton, extras.met2mjd(self.arrivalTimeLastPhoton),
-       str(extras.mjd2gd(extras.met2mjd(self.arrivalTimeLastPhoton))))
-                mailtext = mailtext + "The most recent lightcurve (%.0f-day binned) is attached." % (
-                self.tbin / 24. / 60. / 60.)
+            if self.daily:
+                mailparts.append(MAIL_DAILY_TPL % (self.lastFlux,
+                                                   self.lastFluxErr,
+                                                   self.lastTime, mjds[0], gds[0],
+                                                   self.arrivalTimeLastPhoton, mjds[1], gds[1],
+                                                   self.longtimebin,
+                                                   self.lastFluxLongTimeBin,
+                                                   self.lastFluxErrLongTimeBin,
+                                                   self.lastTimeLongTimeBin, mjds[2], gds[2],
+                                                   self.arrivalTimeLastPhotonLongTimeBin, mjds[3], gds[3]))
+                mailparts.append("The most recent lightcurve (%.0f-day binned in red, and %.0f-day binned in blue) is attached." % (
+                self.tbin / 24. / 60. / 60., self.longtimebin))
+            else:
+                mailparts.append(MAIL_LONG_TPL % (self.longtimebin,
+                                                  self.lastFlux,
+                                                  self.lastFluxErr,
+                                                  self.lastTime, mjds[0], gds[0],
+                                                  self.arrivalTimeLastPhoton, mjds[1], gds[1]))
+                mailparts.append("The most recent lightcurve (%.0f-day binned) is attached." % (
+                self.tbin / 24. / 60. / 60.))
 
             if self.visibleUnderMoonlightOnly:
-                mailtext = mailtext + """
-
-     *NOTE*: %s is visible from your site, but only observable under *moonlight* conditions.
-""" % (self.src)
+                mailparts.append(MAIL_MOONLIGHT_ONLY_TPL % (self.src))
             elif self.visibleUnderMoonlight and not self.visibleUnderMoonlightOnly:
-                mailtext = mailtext + """
-
-     *NOTE*: %s is visible from your site, and observable both under *dark* and *moonlight* conditions.
-""" % (self.src)
+                mailparts.append(MAIL_MOONLIGHT_AND_DARK_TPL % (self.src))
             elif self.visibleInDarkness and not self.visibleUnderMoonlight:
-                mailtext = mailtext + """
-
-     *NOTE*: %s is visible from your site, and observable under *dark* conditions.
-""" % (self.src)
+                mailparts.append(MAIL_DARK_TPL % (self.src))
 
             if self.too == 'True':
-                mailtext=mailtext+"""
-
-     *NOTE*: a ToO is currently ongoing on %s, this alert is forced.
-"""%(self.src)
+                mailparts.append(MAIL_TOO_TPL % (self.src))
 
             if FLAGASSUMEDGAMMA is True:
-                mailtext = mailtext + """
-
-     *WARNING*: The source %s is not found in the 4FGL catalogue, its photon index is thus assumed to be %.2f for the light curve computation.
-""" % (self.src, ASSUMEDGAMMA)
-
-            mailtext = mailtext + """
+                mailparts.append(MAIL_ASSUMED_GAMMA_TPL % (self.src, ASSUMEDGAMMA))
 
-     *Disclaimer*: Be careful, though, that these light curves are not computed using the usual, clean, standard (un)binned likelihood procedure one should normally use for a good quality, publication-ready result. Those reported here only rely on a "quick & dirty" aperture photometric analysis (cf. e.g. http://fermi.gsfc.nasa.gov/ssc/data/analysis/scitools/aperture_photometry.html), which basically assumes that the data set, within 1 degree around the source, is background-free.
-
-      Cheers,
-      FLaapLUC.
-"""
+            mailparts.append(MAIL_DISCLAIMER)
+            mailtext = ''.join(mailparts)
 
             txt = MIMEText(mailtext)
             msg.attach(txt)
@@ -1704,23 +2069,18 @@ First, retrieving the last photon files...
             for fig in [self.pngFig, self.energyTimeFig, self.visibilityFig]:
                 try:
                     # Open the files in binary mode.  Let the MIMEImage class automatically guess the specific image type.
-                    fp = open(fig, 'rb')
-                    img = MIMEBase('application', 'octet-stream')
-                    img.set_payload(fp.read())
-                    Encoders.encode_base64(img)
+                    with open(fig, 'rb') as fp:
+                        img = MIMEImage(fp.read())
                     img.add_header('Content-Disposition',
                                    'attachment; filename="%s"' % os.path.basename(fig))
-                    fp.close()
                     msg.attach(img)
                 except:
                     pass
 
-            # Send the email via our own SMTP server.
-            s = smtplib.SMTP()
-            s.set_debuglevel(0)
-            s.connect()
+            # Send the email via our own SMTP server, reusing the same
+            # connection across the alerts of a batch run.
+            s = self._getSMTP()
             s.sendmail(sender, recipient, msg.as_string())
-            s.quit()
 
             logging.info('\033[94m*** Alert sent for {src:s}\033[0m'.format(src=self.src))
 
@@ -1741,45 +2101,31 @@ First, retrieving the last photon files...
         # Search 3FGL name from a 2FGL name
         if '2FGL' in self.fglName:
             cat3FGLfile = self.catalogFile.replace('gll_psc_v08', 'gll_psc_v16')
-            hdulist = fits.open(cat3FGLfile)
-            cat = hdulist[1].data
-            logging.debug('[{src:s}] 2FGL name is {fgl}'.format(src=self.src, fgl=self.fglName.replace('_2FGLJ', '2FGL J').replace('2FGLJ', '2FGL J')))
-
-            found = False
-            for stuff in cat:
-                if stuff.field('2FGL_Name') == self.fglName.replace('_2FGLJ', '2FGL J').replace('2FGLJ', '2FGL J'):
-                    threefglName = stuff.field('Source_Name')
-                    logging.info('[{src:s}] Found the 3FGL counterpart of {two:s}: {three:s}'.format(src=self.src, two=self.fglName, three=threefglName))
-                    found = True
-                    break
-
-            if not found:
-                threefglName = None
+            target = self.fglName.replace('_2FGLJ', '2FGL J').replace('2FGLJ', '2FGL J')
+            logging.debug('[{src:s}] 2FGL name is {fgl}'.format(src=self.src, fgl=target))
+
+            # O(1) lookup in the cached catalog index, instead of a scan over
+            # a re-opened FITS table
+            threefglName = _catalogIndex(cat3FGLfile, '2FGL_Name', 'Source_Name').get(target)
+            if threefglName is not None:
+                logging.info('[{src:s}] Found the 3FGL counterpart of {two:s}: {three:s}'.format(src=self.src, two=self.fglName, three=threefglName))
+            else:
                 logging.info('[{src:s}] No 3FGL counterpart found for {two:s}'.format(src=self.src, two=self.fglName))
-
-            hdulist.close()
             return threefglName
 
         # Search 3FGL name from a 4FGL name
         if '4FGL' in self.fglName:
             cat4FGLfile = self.catalogFile.replace('/3FGL/','/4FGL-DR2/').replace('gll_psc_v16', 'gll_psc_v27')
-            hdulist = fits.open(cat4FGLfile)
-            cat = hdulist[1].data
-            logging.debug('[{src:s}] 4FGL name is {fgl}'.format(src=self.src, fgl=self.fglName.replace('_4FGLJ', '4FGL J').replace('4FGLJ', '4FGL J')))
-
-            found = False
-            for stuff in cat:
-                if stuff.field('Source_Name') == self.fglName.replace('_4FGLJ', '4FGL J').replace('4FGLJ', '4FGL J') and '3FGL' in stuff.field('ASSOC_FGL'):
-                    threefglName = stuff.field('ASSOC_FGL')
-                    logging.info('[{src:s}] Found the 3FGL counterpart of {two:s}: {three:s}'.format(src=self.src, two=self.fglName, three=threefglName))
-                    found = True
-                    break
+            target = self.fglName.replace('_4FGLJ', '4FGL J').replace('4FGLJ', '4FGL J')
+            logging.debug('[{src:s}] 4FGL name is {fgl}'.format(src=self.src, fgl=target))
 
-            if not found:
+            threefglName = _catalogIndex(cat4FGLfile, 'Source_Name', 'ASSOC_FGL').get(target)
+            if threefglName is not None and '3FGL' not in threefglName:
                 threefglName = None
+            if threefglName is not None:
+                logging.info('[{src:s}] Found the 3FGL counterpart of {two:s}: {three:s}'.format(src=self.src, two=self.fglName, three=threefglName))
+            else:
                 logging.info('[{src:s}] No 3FGL counterpart found for {two:s}'.format(src=self.src, two=self.fglName))
-
-            hdulist.close()
             return threefglName
 
 
@@ -1793,28 +2139,14 @@ First, retrieving the last photon files...
             return self.fglName.replace('4FGLJ', '4FGL J')
 
         cat4FGLfile = self.catalogFile.replace('gll_psc_v16', 'gll_psc_v27')
-        hdulist = fits.open(cat4FGLfile)
-        cat = hdulist[1].data
         logging.debug('[{src:s}] 3FGL name is {fgl}'.format(src=self.src, fgl=self.fglName.replace('3FGLJ', '3FGL J')))
 
-        found = False
-        for stuff in cat:
-            if threefglName is not None and stuff.field('ASSOC_FGL') == threefglName.replace('3FGLJ', '3FGL J'):
-                fourfglName = stuff.field('Source_Name')
-                logging.info('[{src:s}] Found the 4FGL counterpart of {three:s}: {four:s}'.format(src=self.src, three=threefglName, four=fourfglName))
-                found = True
-                break
-            elif threefglName is None and stuff.field('ASSOC_FGL') == self.fglName.replace('3FGLJ', '3FGL J'):
-                fourfglName = stuff.field('Source_Name')
-                logging.info('[{src:s}] Found the 4FGL counterpart of {three:s}: {four:s}'.format(src=self.src, three=self.fglName, four=fourfglName))
-                found = True
-                break
-
-        if not found:
-            fourfglName = None
+        ref = threefglName if threefglName is not None else self.fglName
+        fourfglName = _catalogIndex(cat4FGLfile, 'ASSOC_FGL', 'Source_Name').get(ref.replace('3FGLJ', '3FGL J'))
+        if fourfglName is not None:
+            logging.info('[{src:s}] Found the 4FGL counterpart of {three:s}: {four:s}'.format(src=self.src, three=ref, four=fourfglName))
+        else:
             logging.info('[{src:s}] No 4FGL counterpart found for {three:s}'.format(src=self.src, three=self.fglName))
-
-        hdulist.close()
         return fourfglName
 
 
@@ -1833,28 +2165,19 @@ First, retrieving the last photon files...
                                                                                                            'psch_v08').replace('psc_v27',
                                                                                                                                'psch_v08')
             try:
-                hdulist = fits.open(cat2FHLfile)
+                index = _catalogIndex(cat2FHLfile, '3FGL_Name', 'Source_Name')
             except IOError:
                 logging.info('2FHL catalog file not found')
                 return None
-            cat = hdulist[1].data
 
-            found = False
             threefglName = self.search3FGLcounterpart()
-            for stuff in cat:
-                if stuff.field('3FGL_Name') == self.fglName.replace('_3FGLJ', '3FGL J').replace('3FGLJ',
-                                                                                                '3FGL J') or stuff.field(
-                        '3FGL_Name') == str(threefglName).replace('3FGLJ', '3FGL J'):
-                    fhlName = stuff.field('Source_Name')
-                    logging.info('[{src:s}] Found the 2FHL counterpart of {fgl:s}: {fhl:s}'.format(src=self.src, fgl=self.fglName, fhl=fhlName))
-                    found = True
-                    break
-
-            if not found:
-                fhlName = None
+            fhlName = index.get(self.fglName.replace('_3FGLJ', '3FGL J').replace('3FGLJ', '3FGL J'))
+            if fhlName is None:
+                fhlName = index.get(str(threefglName).replace('3FGLJ', '3FGL J'))
+            if fhlName is not None:
+                logging.info('[{src:s}] Found the 2FHL counterpart of {fgl:s}: {fhl:s}'.format(src=self.src, fgl=self.fglName, fhl=fhlName))
+            else:
                 logging.info('[{src:s}] No 2FHL counterpart found for {fgl:s}'.format(src=self.src, fgl=self.fglName))
-
-            hdulist.close()
             return fhlName
         else:
             return None
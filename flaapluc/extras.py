@@ -9,6 +9,23 @@ Extras functions for FLaapLUC
 @author Jean-Philippe Lenain <mailto:jlenain@in2p3.fr>
 """
 
+# numba is optional: when present, the scalar time converters below are
+# compiled into true numpy ufuncs, when absent they stay plain Python
+try:
+    from numba import vectorize as _nb_vectorize
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Fermi mission reference epoch (2001.0 UTC) in MJD
+MJDREFI = 51910.0
+MJDREFF = 7.428703703703703e-4
+# MJD at the UNIX epoch (1970-01-01 00:00)
+UNIX_MJDREF = 40587.0
+SEC_PER_DAY = 86400.0
+_INV_SEC_PER_DAY = 1.0 / SEC_PER_DAY
+
+
 def met2mjd(met):
     """
     Converts Mission Elapsed Time (MET, in seconds) in Modified Julian Day.
@@ -18,9 +35,7 @@ def met2mjd(met):
     Input: time in MET (s)
     Output: time in MJD (fraction of a day)
     """
-    MJDREFI = 51910.0
-    MJDREFF = 7.428703703703703e-4
-    return (MJDREFI + MJDREFF + met / 24. / 60. / 60.)
+    return (MJDREFI + MJDREFF + met * _INV_SEC_PER_DAY)
 
 
 def mjd2met(mjd):
@@ -32,9 +47,7 @@ def mjd2met(mjd):
     Input:  time in MJD (fraction of a day)
     Output: time in MET (s)
     """
-    MJDREFI = 51910.0
-    MJDREFF = 7.428703703703703e-4
-    return (24. * 60. * 60 * (mjd - MJDREFI - MJDREFF))
+    return (SEC_PER_DAY * (mjd - MJDREFI - MJDREFF))
 
 
 def unixtime2mjd(unixtime):
@@ -47,10 +60,16 @@ def unixtime2mjd(unixtime):
     """
 
     # unixtime gives seconds passed since "The Epoch": 1.1.1970 00:00
-    # MJD at that time was 40587.0
+    return UNIX_MJDREF + unixtime * _INV_SEC_PER_DAY
+
 
-    result = 40587.0 + unixtime / (24. * 60. * 60.)
-    return result
+if HAS_NUMBA:
+    # Compile the affine converters as ufuncs, so that per-photon calls in
+    # Python loops drop the interpreter dispatch cost. cache=True keeps the
+    # compiled code on disk, amortizing the one-off compilation.
+    met2mjd = _nb_vectorize(['float64(float64)'], cache=True)(met2mjd)
+    mjd2met = _nb_vectorize(['float64(float64)'], cache=True)(mjd2met)
+    unixtime2mjd = _nb_vectorize(['float64(float64)'], cache=True)(unixtime2mjd)
 
 
 def jd2gd(x):
@@ -95,23 +114,10 @@ def jd2gd(x):
     if mm < 2.5:
         yyyy = C - 4715
 
-    daylist = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    daylist2 = [31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-
     h = int((dd - int(dd)) * 24)
     min = int((((dd - int(dd)) * 24) - h) * 60)
     sec = 86400 * (dd - int(dd)) - h * 3600 - min * 60
 
-    # Now calculate the fractional year. Do we have a leap year?
-    if (yyyy % 4 != 0):
-        days = daylist2
-    elif (yyyy % 400 == 0):
-        days = daylist2
-    elif (yyyy % 100 == 0):
-        days = daylist
-    else:
-        days = daylist2
-
     string = "%04d-%02d-%02d %02d:%02d:%04.1f" % (yyyy, mm, dd, h, min, sec)
 
     return string
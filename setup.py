@@ -1,9 +1,5 @@
 from setuptools import setup, find_packages
 
-import sys
-if sys.version_info >= (3,0):
-    sys.exit('Sorry, Python >= 3.0 is not supported')
-
 setup(name='flaapluc',
       version='1.2.3',
       description='Quick generation of alerts from Fermi-LAT data',
@@ -12,10 +8,12 @@ setup(name='flaapluc',
       author_email='jlenain@in2p3.fr',
       license='BSD',
       packages=find_packages(),
+      python_requires='>=3.8',
       install_requires=[
           'astropy',
           'matplotlib',
-          'ephem'
+          'ephem',
+          'requests'
       ],
       scripts=[
           'bin/flaapluc',